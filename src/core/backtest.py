@@ -11,6 +11,7 @@ def run_backtest(strategy, config: Dict[str, Any]) -> BacktestResult:
     equity_curve: List[Dict[str, Any]] = []
 
     states: List[Dict[str, Any]] = load_states_for_config(config)
+    strategy.prepare(states)
 
     for idx, state in enumerate(states):
         equity_before = _compute_equity(state, portfolio)
@@ -68,6 +69,9 @@ def _compute_equity(state, portfolio):
 
 
 def _get_market(state, market_id):
+    by_id = state.get("markets_by_id")
+    if by_id is not None:
+        return by_id.get(market_id)
     for m in state["markets"]:
         if m["market_id"] == market_id:
             return m
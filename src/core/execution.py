@@ -99,6 +99,7 @@ def _open_position(intent, market, price, state, portfolio: PortfolioState):
         open_fee=open_fee,
     )
     portfolio.positions[intent.market_id] = pos
+    portfolio._on_open(pos)
 
     portfolio.cash -= (size + open_fee)
 
@@ -124,6 +125,7 @@ def _close_position(market_id, price, state, portfolio: PortfolioState, auto=Fal
     proceeds = pos.contracts * price
     portfolio.cash += (proceeds - close_fee)
     del portfolio.positions[market_id]
+    portfolio._on_close(market_id)
 
     pnl = pos.contracts * (price - pos.entry_price) - pos.open_fee - close_fee
 
@@ -140,6 +142,9 @@ def _close_position(market_id, price, state, portfolio: PortfolioState, auto=Fal
 
 
 def _get_market(state, market_id):
+    by_id = state.get("markets_by_id")
+    if by_id is not None:
+        return by_id.get(market_id)
     for m in state.get("markets", []):
         if m.get("market_id") == market_id:
             return m
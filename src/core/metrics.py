@@ -1,3 +1,10 @@
+from bisect import bisect_right
+
+# Entry-price bucket edges; _BUCKET_NAMES[bisect_right(_BUCKET_EDGES, p)]
+_BUCKET_EDGES = (0.05, 0.10, 0.15)
+_BUCKET_NAMES = ("0-0.05", "0.05-0.10", "0.10-0.15", "0.15+")
+
+
 def compute_metrics(cash, equity_curve, trades):
     if not equity_curve:
         return {
@@ -67,16 +74,25 @@ def compute_metrics(cash, equity_curve, trades):
                 }
             )
 
-    wins = []
-    losses = []
+    # Single fused pass: accumulate scalars instead of building lists
+    wins_sum = 0.0
+    wins_n = 0
+    losses_sum = 0.0
+    losses_n = 0
     total_fees = 0.0
     gross_pnl_sum = 0.0
 
     buckets = {
-        "0-0.05": [],
-        "0.05-0.10": [],
-        "0.10-0.15": [],
-        "0.15+": [],
+        name: {
+            "count": 0,
+            "pnl_sum": 0.0,
+            "wins_sum": 0.0,
+            "wins_n": 0,
+            "losses_sum": 0.0,
+            "losses_n": 0,
+            "fees_sum": 0.0,
+        }
+        for name in _BUCKET_NAMES
     }
 
     for rt in round_trips:
@@ -88,50 +104,49 @@ def compute_metrics(cash, equity_curve, trades):
         gross_pnl_sum += rt["gross_pnl"]
 
         if pnl > 0:
-            wins.append(pnl)
+            wins_sum += pnl
+            wins_n += 1
         elif pnl < 0:
-            losses.append(pnl)
+            losses_sum += pnl
+            losses_n += 1
 
         if entry_price is not None:
-            if entry_price < 0.05:
-                buckets["0-0.05"].append(rt)
-            elif entry_price < 0.10:
-                buckets["0.05-0.10"].append(rt)
-            elif entry_price < 0.15:
-                buckets["0.10-0.15"].append(rt)
-            else:
-                buckets["0.15+"].append(rt)
+            b = buckets[_BUCKET_NAMES[bisect_right(_BUCKET_EDGES, entry_price)]]
+
+            b["count"] += 1
+            b["pnl_sum"] += pnl
+            b["fees_sum"] += fees_rt
+            if pnl > 0:
+                b["wins_sum"] += pnl
+                b["wins_n"] += 1
+            elif pnl < 0:
+                b["losses_sum"] += pnl
+                b["losses_n"] += 1
 
     num_round_trips = len(round_trips)
     num_closes = num_round_trips
-    hit_rate = (len(wins) / num_closes) if num_closes else 0.0
-    avg_win = (sum(wins) / len(wins)) if wins else 0.0
-    avg_loss = (sum(losses) / len(losses)) if losses else 0.0
+    hit_rate = (wins_n / num_closes) if num_closes else 0.0
+    avg_win = (wins_sum / wins_n) if wins_n else 0.0
+    avg_loss = (losses_sum / losses_n) if losses_n else 0.0
     avg_fee_per_round_trip = (
         total_fees / num_round_trips) if num_round_trips else 0.0
 
     gross_pnl = total_pnl + total_fees  # net + fees = theoretical gross
 
     bucket_stats = {}
-    for name, arr in buckets.items():
-        if arr:
-            pnls = [x["pnl"] for x in arr]
-            fees_arr = [x["fees"] for x in arr]
-
-            wins_b = [x for x in pnls if x > 0]
-            losses_b = [x for x in pnls if x < 0]
-
-            total = len(arr)
-            total_fees_b = sum(fees_arr)
+    for name, b in buckets.items():
+        total = b["count"]
+        if total:
+            total_fees_b = b["fees_sum"]
 
             bucket_stats[name] = {
                 "count": total,
-                "hit_rate": len(wins_b) / total if total else 0.0,
-                "avg_pnl": sum(pnls) / total if total else 0.0,
-                "avg_win": (sum(wins_b) / len(wins_b)) if wins_b else 0.0,
-                "avg_loss": (sum(losses_b) / len(losses_b)) if losses_b else 0.0,
+                "hit_rate": b["wins_n"] / total,
+                "avg_pnl": b["pnl_sum"] / total,
+                "avg_win": (b["wins_sum"] / b["wins_n"]) if b["wins_n"] else 0.0,
+                "avg_loss": (b["losses_sum"] / b["losses_n"]) if b["losses_n"] else 0.0,
                 "total_fees": total_fees_b,
-                "avg_fee": (total_fees_b / total) if total else 0.0,
+                "avg_fee": total_fees_b / total,
             }
         else:
             bucket_stats[name] = {
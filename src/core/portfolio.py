@@ -8,6 +8,25 @@ class PortfolioState:
         self.positions: Dict[str, Position] = {}
         self.trade_log: List[Trade] = []
 
+        # Strategy-facing positions view, kept in sync by _on_open/_on_close
+        # so get_portfolio_view doesn't rebuild it every tick.
+        self._positions_view: Dict[str, Dict[str, float]] = {}
+        # market_id -> dollars_at_risk, for one-lookup "already open?" checks
+        self._risk_by_id: Dict[str, float] = {}
+
+    def _on_open(self, pos: Position) -> None:
+        dollars_at_risk = pos.contracts * pos.entry_price
+        self._risk_by_id[pos.market_id] = dollars_at_risk
+        self._positions_view[pos.market_id] = {
+            "dollars_at_risk": dollars_at_risk,
+            "contracts": pos.contracts,
+            "entry_price": pos.entry_price,
+        }
+
+    def _on_close(self, market_id: str) -> None:
+        self._positions_view.pop(market_id, None)
+        self._risk_by_id.pop(market_id, None)
+
     def get_portfolio_view(self, equity: float) -> Dict[str, any]:
         """
         Returns strategy-facing snapshot.
@@ -22,20 +41,15 @@ class PortfolioState:
                 },
                 ...
             },
+            "risk_by_id": {market_id: dollars_at_risk, ...},
         }
-        """
-        positions_view: Dict[str, Dict[str, float]] = {}
-
-        for mid, pos in self.positions.items():
-            dollars_at_risk = pos.contracts * pos.entry_price
-            positions_view[mid] = {
-                "dollars_at_risk": dollars_at_risk,
-                "contracts": pos.contracts,
-                "entry_price": pos.entry_price,
-            }
 
+        "positions" and "risk_by_id" are live, incrementally-maintained
+        views; strategies must treat them as read-only.
+        """
         return {
             "cash": self.cash,
             "equity": equity,
-            "positions": positions_view,
+            "positions": self._positions_view,
+            "risk_by_id": self._risk_by_id,
         }
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import argparse
-import json
-from dataclasses import dataclass, asdict
+import functools
+from dataclasses import dataclass
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+import orjson
 import requests
 from nba_api.stats.endpoints import scoreboardv2
 from zoneinfo import ZoneInfo
@@ -14,9 +16,14 @@ from zoneinfo import ZoneInfo
 KALSHI_BASE_URL = "https://api.elections.kalshi.com/trade-api/v2"
 SERIES_TICKER = "KXNBAGAME"
 JOBS_DIR = Path(__file__).resolve().parent / "jobs"
+MAX_EVENT_PAGES = 20  # safety cap on /events cursor pagination
+
+# Shared keep-alive session so paginated requests reuse one TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
 
 # Static mapping from NBA TEAM_ID -> standard abbreviation
-TEAM_ID_TO_ABBREV: Dict[int, str] = {
+TEAM_ID_TO_ABBREV: Mapping[int, str] = MappingProxyType({
     # East
     1610612737: "ATL",
     1610612738: "BOS",
@@ -49,6 +56,12 @@ TEAM_ID_TO_ABBREV: Dict[int, str] = {
     1610612758: "SAC",
     1610612759: "SAS",
     1610612762: "UTA",
+})
+
+# Kalshi event tickers encode the month as a 3-letter uppercase code
+_MONTHS: Dict[str, int] = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
 }
 
 
@@ -67,6 +80,19 @@ class Job:
 # NBA side
 # --------------------------------------------------------------------
 
+def _team_abbrev(team_id: Any) -> Optional[str]:
+    """
+    Look up a team abbreviation. ScoreboardV2 already returns ints, so only
+    fall back to int() for the odd string/float id.
+    """
+    if type(team_id) is int:
+        return TEAM_ID_TO_ABBREV.get(team_id)
+    try:
+        return TEAM_ID_TO_ABBREV.get(int(team_id))
+    except (TypeError, ValueError):
+        return None
+
+
 def _parse_tipoff_utc(game_date: date, status_text: str) -> Optional[str]:
     """
     GAME_STATUS_TEXT is usually:
@@ -124,8 +150,8 @@ def _fetch_nba_games_for_date(target_date: date) -> List[Dict[str, Any]]:
         if not game_id or home_id is None or away_id is None:
             continue
 
-        home_abbrev = TEAM_ID_TO_ABBREV.get(int(home_id))
-        away_abbrev = TEAM_ID_TO_ABBREV.get(int(away_id))
+        home_abbrev = _team_abbrev(home_id)
+        away_abbrev = _team_abbrev(away_id)
 
         if not home_abbrev or not away_abbrev:
             print(
@@ -159,9 +185,12 @@ def _fetch_kalshi_events() -> List[Dict[str, Any]]:
     """
     Fetch all NBA (KXNBAGAME) events with nested markets.
     We don't filter by date here; we'll do that ourselves.
+
+    Follows the response cursor until exhausted, reusing one keep-alive
+    session for every page.
     """
     url = f"{KALSHI_BASE_URL}/events"
-    params = {
+    params: Dict[str, Any] = {
         "series_ticker": SERIES_TICKER,
         "with_nested_markets": "true",
         "status": "open",
@@ -169,22 +198,40 @@ def _fetch_kalshi_events() -> List[Dict[str, Any]]:
     }
 
     print(f"[discover_games] fetching Kalshi events from {url}")
-    resp = requests.get(url, params=params, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
-
-    # API sometimes returns {"events": [...]} and sometimes a bare list.
-    if isinstance(data, dict):
-        events = data.get("events", []) or []
-    elif isinstance(data, list):
-        events = data
+    events: List[Dict[str, Any]] = []
+
+    for _ in range(MAX_EVENT_PAGES):
+        resp = _SESSION.get(url, params=params, timeout=10)
+        resp.raise_for_status()
+        # orjson parses the raw body directly; much faster than resp.json()
+        # on the nested-markets payload.
+        data = orjson.loads(resp.content)
+
+        # API sometimes returns {"events": [...]} and sometimes a bare list.
+        if isinstance(data, dict):
+            events.extend(data.get("events", []) or [])
+            cursor = data.get("cursor")
+        elif isinstance(data, list):
+            events.extend(data)
+            cursor = None
+        else:
+            cursor = None
+
+        if not cursor:
+            break
+        params["cursor"] = cursor
     else:
-        events = []
+        # cap hit with a cursor still pending: later events were not fetched
+        print(
+            f"[discover_games] WARNING: stopped after {MAX_EVENT_PAGES} pages "
+            f"with more events pending (cursor={cursor!r}); results truncated"
+        )
 
     print(f"[discover_games] Kalshi events fetched: {len(events)}")
     return events
 
 
+@functools.lru_cache(maxsize=4096)
 def _parse_nba_event_ticker(event_ticker: str) -> Optional[Tuple[date, str, str]]:
     """
     Parse an NBA event ticker like:
@@ -209,11 +256,14 @@ def _parse_nba_event_ticker(event_ticker: str) -> Optional[Tuple[date, str, str]
     mon_str = date_code[2:5]
     dd_str = date_code[5:7]
 
+    # Map "NOV" etc to month int via static table (no strptime)
+    month = _MONTHS.get(mon_str.upper())
+    if month is None:
+        return None
+
     try:
         yy = int(yy_str)
         day = int(dd_str)
-        # Map "NOV" etc to month int via datetime
-        month = datetime.strptime(mon_str, "%b").month
         year = 2000 + yy           # assume 20xx
         event_dt = date(year, month, day)
     except Exception:
@@ -330,10 +380,8 @@ def _write_jobs_file(jobs: List[Job], target_date: date) -> Path:
     JOBS_DIR.mkdir(parents=True, exist_ok=True)
     out_path = JOBS_DIR / f"jobs_{target_date.isoformat()}.json"
 
-    payload = [asdict(j) for j in jobs]
-
-    with open(out_path, "w") as f:
-        json.dump(payload, f, indent=2)
+    # orjson serializes the Job dataclasses natively (no asdict deep copy)
+    out_path.write_bytes(orjson.dumps(jobs, option=orjson.OPT_INDENT_2))
 
     print(f"[discover_games] wrote {len(jobs)} jobs to {out_path}")
     return out_path
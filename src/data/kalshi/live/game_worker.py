@@ -6,16 +6,19 @@ import base64
 import json
 import os
 import time
+import orjson
 import requests
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import websockets  # pip install websockets
+from cryptography.hazmat.backends.openssl import backend as openssl_backend
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from dotenv import load_dotenv
 
+from ..merged.load_states import TERMINAL_STATUSES
 from .discover_games import Job  # reuse Job dataclass from discover_games.py
 
 # ---------------------------------------------------------------------------
@@ -38,6 +41,12 @@ PRIVATE_KEY_PATH = PROJECT_ROOT / "kalshi_private_key.pem"
 
 PREGAME_MINUTES_DEFAULT = 10  # how long before tipoff to start streaming
 INACTIVITY_RECONNECT_SECS = 90.0
+WRITE_BUFFER_BYTES = 1 << 20  # per-market jsonl buffer
+FLUSH_INTERVAL_SECS = 2.0     # how often buffered ticks are flushed + fsynced
+WS_HEADERS_MAX_AGE_MS = 20_000  # reuse a signed WS auth header this long
+WS_MAX_FRAME_BYTES = 1 << 20    # largest ticker frame we accept
+WS_PING_INTERVAL_SECS = 20.0    # keepalive pings; well under the reconnect idle
+WS_PING_TIMEOUT_SECS = 20.0
 
 
 # ---------------------------------------------------------------------------
@@ -64,22 +73,55 @@ def _sign_pss_text(private_key: Any, text: str) -> str:
     return base64.b64encode(signature).decode("utf-8")
 
 
+# (timestamp_ms, headers) of the last signed WS auth header
+_cached_ws_headers: Optional[tuple[int, Dict[str, str]]] = None
+
+
+def _log_crypto_backend() -> None:
+    """
+    Log the OpenSSL build doing our RSA-PSS / SHA-256 signing, and warn if
+    OPENSSL_ia32cap is set (it can mask SHA-NI/AVX and force scalar code).
+    """
+    print(f"[game_worker] crypto backend: {openssl_backend.openssl_version_text()}")
+    ia32cap = os.getenv("OPENSSL_ia32cap")
+    if ia32cap:
+        print(
+            f"[game_worker] WARNING: OPENSSL_ia32cap={ia32cap} overrides CPU "
+            f"feature detection; unset it to let OpenSSL use SHA-NI."
+        )
+
+
 def _create_ws_headers(private_key: Any) -> Dict[str, str]:
+    """
+    Build signed WS auth headers. RSA-PSS signing is the expensive part, so
+    reuse the last signature while it is younger than WS_HEADERS_MAX_AGE_MS
+    (e.g. across quick reconnects).
+    """
+    global _cached_ws_headers
+
     if not API_KEY_ID:
         raise RuntimeError(
             "KALSHI_API_KEY_ID env var is required for WebSocket auth")
 
-    timestamp = str(int(time.time() * 1000))
+    now_ms = int(time.time() * 1000)
+    if _cached_ws_headers is not None:
+        signed_at_ms, headers = _cached_ws_headers
+        if now_ms - signed_at_ms < WS_HEADERS_MAX_AGE_MS:
+            return headers
+
+    timestamp = str(now_ms)
     # Per docs: timestamp + "GET" + "/trade-api/ws/v2"
     msg_string = timestamp + "GET" + "/trade-api/ws/v2"
     signature = _sign_pss_text(private_key, msg_string)
 
-    return {
+    headers = {
         "Content-Type": "application/json",
         "KALSHI-ACCESS-KEY": API_KEY_ID,
         "KALSHI-ACCESS-SIGNATURE": signature,
         "KALSHI-ACCESS-TIMESTAMP": timestamp,
     }
+    _cached_ws_headers = (now_ms, headers)
+    return headers
 
 
 # ---------------------------------------------------------------------------
@@ -154,82 +196,263 @@ def _all_markets_terminal_rest(market_tickers: List[str]) -> bool:
     return all_terminal
 
 
+async def _all_markets_terminal(market_tickers: List[str]) -> bool:
+    """
+    _all_markets_terminal_rest off the event loop: the blocking REST calls
+    run in a worker thread so other streams on this loop keep receiving.
+    """
+    return await asyncio.to_thread(_all_markets_terminal_rest, market_tickers)
+
+
 # ---------------------------------------------------------------------------
 # Core WS loop
 # ---------------------------------------------------------------------------
-TERMINAL_STATUSES = {"finalized", "inactive", "settled", "closed"}
 
+# cached "YYYY-MM-DDT" prefix for the UTC day currently being streamed
+_iso_day: Optional[int] = None
+_iso_day_prefix: str = ""
 
-async def _run_ws_for_job(job: Job, pregame_minutes: int):
-    private_key = _load_private_key()
 
-    start_at = _compute_start_time(job, pregame_minutes)
-    now = datetime.now(timezone.utc)
-    if start_at and now < start_at:
-        wait_secs = (start_at - now).total_seconds()
-        print(
-            f"[game_worker] Sleeping {wait_secs:.0f}s until pregame window "
-            f"for {job.event_ticker}"
-        )
-        await asyncio.sleep(wait_secs)
+def _epoch_to_iso(ts: float) -> str:
+    """
+    Same output as datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().
+    Kalshi ticks are whole seconds, so only the date prefix goes through
+    datetime (once per UTC day) and the time part is integer math.
+    """
+    global _iso_day, _iso_day_prefix
+
+    if ts != int(ts):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+    days, secs = divmod(int(ts), 86400)
+    if days != _iso_day:
+        day_dt = datetime.fromtimestamp(days * 86400, tz=timezone.utc)
+        _iso_day_prefix = day_dt.date().isoformat() + "T"
+        _iso_day = days
+
+    hh, rem = divmod(secs, 3600)
+    mm, ss = divmod(rem, 60)
+    return f"{_iso_day_prefix}{hh:02d}:{mm:02d}:{ss:02d}+00:00"
+
+
+def _norm_cents(payload: Dict[str, Any], field: str) -> Optional[float]:
+    """
+    Kalshi cents (0-100) -> probability (0-1), or None if missing/invalid.
+    """
+    val = payload.get(field)
+    if val is None:
+        return None
+    try:
+        return float(val) / 100.0
+    except Exception:
+        return None
+
+
+def _sync_writers(writers: Dict[str, Any]) -> None:
+    """
+    Flush every per-market buffer and fsync it: one batched write + fsync
+    per file per FLUSH_INTERVAL_SECS instead of one syscall per tick.
+    """
+    for f in writers.values():
+        f.flush()
+        os.fsync(f.fileno())
 
+
+
+def _open_job_writers(job: Job, writers: Dict[str, Any]) -> None:
     # data dir: src/data/kalshi/live/live_data/<YYYY-MM-DD>/<EVENT_TICKER>/<market>.jsonl
     out_base = DATA_DIR / job.game_date / job.event_ticker
     out_base.mkdir(parents=True, exist_ok=True)
 
+    for mt in job.market_tickers:
+        fp = out_base / f"{mt}.jsonl"
+        writers[mt] = fp.open("ab", buffering=WRITE_BUFFER_BYTES)
+
+
+def _close_job_writers(job: Job, writers: Dict[str, Any]) -> None:
+    # close() flushes whatever is still buffered
+    for mt in job.market_tickers:
+        f = writers.pop(mt, None)
+        if f is None:
+            continue
+        try:
+            f.close()
+        except Exception:
+            pass
+
+
+async def _run_ws_for_job(job: Job, pregame_minutes: int):
+    await _run_ws_for_jobs([job], pregame_minutes)
+
+
+async def _run_ws_for_jobs(jobs: List[Job], pregame_minutes: int):
+    """
+    Stream ticker data for one or more games over a single WS connection.
+
+    Each job's markets join the subscription once its pregame window opens;
+    frames are demultiplexed by market_ticker into that job's per-market
+    jsonl files. Returns once every job's markets are terminal.
+    """
+    private_key = _load_private_key()
+    label = jobs[0].event_ticker if len(jobs) == 1 else f"{len(jobs)} events"
+
+    # (start_at, job) for jobs whose pregame window hasn't opened, earliest
+    # first; start_at None => start immediately
+    pending: List[tuple[datetime, Job]] = sorted(
+        (
+            (_compute_start_time(j, pregame_minutes)
+             or datetime.min.replace(tzinfo=timezone.utc), j)
+            for j in jobs
+        ),
+        key=lambda x: x[0],
+    )
+    active: List[Job] = []
+
     writers: Dict[str, Any] = {}
-    try:
+    ticker_to_job: Dict[str, Job] = {}
+
+    # markets whose latest status is terminal; a job is done once all of
+    # its markets are in here
+    terminal_markets: set[str] = set()
+    # last raw status string seen per market; status only needs to be
+    # lowercased / re-checked when it actually changes
+    prev_raw_status: Dict[str, str] = {}
+
+    def activate_due_jobs() -> List[Job]:
+        now = datetime.now(timezone.utc)
+        started: List[Job] = []
+        while pending and pending[0][0] <= now:
+            _, job = pending.pop(0)
+            _open_job_writers(job, writers)
+            for mt in job.market_tickers:
+                ticker_to_job[mt] = job
+            active.append(job)
+            started.append(job)
+        return started
+
+    def finish_job(job: Job) -> None:
+        _close_job_writers(job, writers)
         for mt in job.market_tickers:
-            fp = out_base / f"{mt}.jsonl"
-            f = fp.open("a", encoding="utf-8")
-            writers[mt] = f
-
-        # track latest status for each market
-        latest_status: Dict[str, str] = {}
+            ticker_to_job.pop(mt, None)
+        active.remove(job)
 
-        while True:
-            if _all_markets_terminal_rest(job.market_tickers):
+    try:
+        # ticks are buffered; sync all writers at most every FLUSH_INTERVAL_SECS
+        next_flush = time.monotonic() + FLUSH_INTERVAL_SECS
+        cmd_id = 0
+
+        while pending or active:
+            activate_due_jobs()
+            if not active:
+                wait_secs = (pending[0][0] -
+                             datetime.now(timezone.utc)).total_seconds()
                 print(
-                    f"[game_worker] All markets terminal (REST) for "
-                    f"{job.event_ticker}; exiting worker."
+                    f"[game_worker] Sleeping {wait_secs:.0f}s until pregame window "
+                    f"for {pending[0][1].event_ticker}"
                 )
-                return
+                await asyncio.sleep(max(wait_secs, 0.0))
+                continue
+
+            # check every active game concurrently, so a reconnect of the
+            # shared socket waits for one round of REST calls, not one per game
+            done = await asyncio.gather(
+                *(_all_markets_terminal(j.market_tickers) for j in active)
+            )
+            for job, is_done in zip(list(active), done):
+                if is_done:
+                    print(
+                        f"[game_worker] All markets terminal (REST) for "
+                        f"{job.event_ticker}; exiting worker."
+                    )
+                    finish_job(job)
+            if not active:
+                continue
+
             headers = _create_ws_headers(private_key)
             try:
-                async with websockets.connect(WS_URL, additional_headers=headers) as ws:
+                # ticker frames are tiny JSON objects: permessage-deflate only
+                # costs a zlib inflate per frame without saving real bandwidth
+                async with websockets.connect(
+                    WS_URL,
+                    additional_headers=headers,
+                    compression=None,
+                    max_size=WS_MAX_FRAME_BYTES,
+                    ping_interval=WS_PING_INTERVAL_SECS,
+                    ping_timeout=WS_PING_TIMEOUT_SECS,
+                ) as ws:
+                    tickers = [t for j in active for t in j.market_tickers]
                     print(
-                        f"[game_worker] Connected WS for {job.event_ticker}; "
-                        f"subscribing to ticker for {len(job.market_tickers)} markets"
+                        f"[game_worker] Connected WS for {label}; "
+                        f"subscribing to ticker for {len(tickers)} markets"
                     )
 
+                    cmd_id += 1
                     sub_msg = {
-                        "id": 1,
+                        "id": cmd_id,
                         "cmd": "subscribe",
                         "params": {
                             "channels": ["ticker"],
-                            "market_tickers": job.market_tickers,
+                            "market_tickers": tickers,
                         },
                     }
                     await ws.send(json.dumps(sub_msg))
+                    sid: Optional[int] = None  # from the "subscribed" ack
 
                     # track last time we saw ANY ticker message
                     last_ticker_ts = datetime.now(timezone.utc)
 
-                    while True:
-                        # bail out if we hit end-of-game window (if you keep end_at logic)
-                        # if end_at and datetime.now(timezone.utc) >= end_at:
-                        #     print(f"[game_worker] End window reached while streaming {job.event_ticker}; closing WS.")
-                        #     return
+                    while active:
+                        # periodic flush + fsync (runs after every message / recv
+                        # timeout), done in a thread so disk latency never blocks
+                        # the event loop
+                        now_mono = time.monotonic()
+                        if now_mono >= next_flush:
+                            await asyncio.to_thread(_sync_writers, writers)
+                            next_flush = now_mono + FLUSH_INTERVAL_SECS
+
+                        # add games whose pregame window just opened
+                        if pending and pending[0][0] <= datetime.now(timezone.utc):
+                            if sid is None:
+                                # not acked yet; reconnect and subscribe to all
+                                break
+                            new_tickers = [
+                                t for j in activate_due_jobs()
+                                for t in j.market_tickers
+                            ]
+                            cmd_id += 1
+                            await ws.send(json.dumps({
+                                "id": cmd_id,
+                                "cmd": "update_subscription",
+                                "params": {
+                                    "sids": [sid],
+                                    "market_tickers": new_tickers,
+                                    "action": "add_markets",
+                                },
+                            }))
+                            print(
+                                f"[game_worker] Added {len(new_tickers)} markets "
+                                f"to WS subscription for {label}"
+                            )
+
+                        # wake up in time for the next pregame window
+                        recv_timeout = 30.0
+                        if pending:
+                            until_next = (pending[0][0] -
+                                          datetime.now(timezone.utc)).total_seconds()
+                            recv_timeout = min(
+                                recv_timeout, max(until_next, 0.0) + 0.1)
 
                         try:
-                            raw = await asyncio.wait_for(ws.recv(), timeout=30.0)
+                            # decode=False: keep text frames as bytes for orjson
+                            raw = await asyncio.wait_for(
+                                ws.recv(decode=False), timeout=recv_timeout)
                         except asyncio.TimeoutError:
-                            # no message in 30s; if we haven't seen *any* ticker in a while, reconnect
+                            # no message for a while; if we haven't seen *any* ticker in a while, reconnect
                             idle = (datetime.now(timezone.utc) -
                                     last_ticker_ts).total_seconds()
                             if idle > INACTIVITY_RECONNECT_SECS:
                                 print(
-                                    f"[game_worker] No ticker msgs for {job.event_ticker} in "
+                                    f"[game_worker] No ticker msgs for {label} in "
                                     f"{idle:.0f}s; forcing WS reconnect."
                                 )
                                 # break out of inner loop → outer loop will reconnect
@@ -237,13 +460,25 @@ async def _run_ws_for_job(job: Job, pregame_minutes: int):
                             else:
                                 continue
 
+                        # Cheap substring filter before parsing: every ticker
+                        # frame contains the "ticker" token; skip the rest
+                        # (except errors, which we still want to see).
+                        if b'"ticker"' not in raw:
+                            if b'"error"' in raw:
+                                print(
+                                    f"[game_worker] WS error frame for "
+                                    f"{label}: {raw[:500]!r}"
+                                )
+                            continue
+
                         try:
-                            msg = json.loads(raw)
-                        except json.JSONDecodeError:
+                            msg = orjson.loads(raw)
+                        except orjson.JSONDecodeError:
                             continue
 
                         msg_type = msg.get("type")
                         if msg_type == "subscribed":
+                            sid = (msg.get("msg") or {}).get("sid")
                             continue
                         if msg_type != "ticker":
                             continue
@@ -254,70 +489,62 @@ async def _run_ws_for_job(job: Job, pregame_minutes: int):
                         mkt = payload.get("market_ticker")
                         if not mkt or mkt not in writers:
                             continue
+                        job = ticker_to_job[mkt]
 
                         kalshi_ts = payload.get("ts")  # seconds since epoch
                         if isinstance(kalshi_ts, (int, float)):
-                            ts_iso = datetime.fromtimestamp(
-                                kalshi_ts, tz=timezone.utc).isoformat()
+                            ts_iso = _epoch_to_iso(kalshi_ts)
                         else:
                             ts_iso = datetime.now(timezone.utc).isoformat()
 
-                        def norm_cents(field: str) -> Optional[float]:
-                            val = payload.get(field)
-                            if val is None:
-                                return None
-                            try:
-                                return float(val) / 100.0
-                            except Exception:
-                                return None
-
                         status = payload.get("status")
-                        if isinstance(status, str):
-                            status_lower = status.lower()
-                            latest_status[mkt] = status_lower
-                        else:
-                            status_lower = None
+                        became_terminal = False
+                        if (
+                            isinstance(status, str)
+                            and status != prev_raw_status.get(mkt)
+                        ):
+                            prev_raw_status[mkt] = status
+                            if status.lower() in TERMINAL_STATUSES:
+                                became_terminal = mkt not in terminal_markets
+                                terminal_markets.add(mkt)
+                            else:
+                                terminal_markets.discard(mkt)
 
                         record = {
                             "ts_iso": ts_iso,
                             "kalshi_ts": kalshi_ts,
                             "event_ticker": job.event_ticker,
                             "market_ticker": mkt,
-                            "price_prob": norm_cents("price"),
-                            "yes_bid_prob": norm_cents("yes_bid"),
-                            "yes_ask_prob": norm_cents("yes_ask"),
+                            "price_prob": _norm_cents(payload, "price"),
+                            "yes_bid_prob": _norm_cents(payload, "yes_bid"),
+                            "yes_ask_prob": _norm_cents(payload, "yes_ask"),
                             "volume": payload.get("volume"),
                             "open_interest": payload.get("open_interest"),
                             "status": status,
                         }
 
                         f = writers[mkt]
-                        f.write(json.dumps(record) + "\n")
-                        f.flush()
-
-                        # If every market we care about is terminal => stop.
-                        if latest_status and all(
-                            latest_status.get(
-                                t, "").lower() in TERMINAL_STATUSES
-                            for t in job.market_tickers
+                        f.write(orjson.dumps(
+                            record, option=orjson.OPT_APPEND_NEWLINE))
+
+                        # If every market of this game is terminal => done with it.
+                        if became_terminal and terminal_markets.issuperset(
+                            job.market_tickers
                         ):
                             print(
                                 f"[game_worker] All markets terminal for "
                                 f"{job.event_ticker}; shutting down."
                             )
-                            return
+                            finish_job(job)
 
             except Exception as e:
-                print(f"[game_worker] WS error for {job.event_ticker}: {e!r}")
+                print(f"[game_worker] WS error for {label}: {e!r}")
                 # reconnect after brief backoff
                 await asyncio.sleep(5.0)
 
     finally:
-        for f in writers.values():
-            try:
-                f.close()
-            except Exception:
-                pass
+        for job in list(active):
+            _close_job_writers(job, writers)
 
 
 # ---------------------------------------------------------------------------
@@ -351,6 +578,7 @@ def main() -> None:
     args = _parse_args()
     job = _load_job_for_event(args.date, args.event_ticker)
     print(f"[game_worker] Loaded job: {job}")
+    _log_crypto_backend()
 
     asyncio.run(
         _run_ws_for_job(
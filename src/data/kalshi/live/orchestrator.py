@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import subprocess
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .discover_games import Job
+from .game_worker import _log_crypto_backend, _run_ws_for_job, _run_ws_for_jobs
+
 LIVE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = LIVE_DIR.parent.parent.parent.parent
 JOBS_DIR = LIVE_DIR / "jobs"
@@ -33,6 +37,26 @@ def _filter_jobs(
     ]
 
 
+async def _run_job_tasks(
+    jobs: List[Dict[str, Any]],
+    pregame_minutes: int,
+) -> None:
+    """
+    Run one _run_ws_for_job per game concurrently in this event loop, so
+    interpreter startup, imports and key loading are paid once.
+    """
+    job_objs = [Job(**j) for j in jobs]
+    results = await asyncio.gather(
+        *[_run_ws_for_job(job, pregame_minutes) for job in job_objs],
+        return_exceptions=True,
+    )
+    for job, res in zip(job_objs, results):
+        if isinstance(res, BaseException):
+            print(f"[orchestrator] Worker {job.event_ticker} failed: {res!r}")
+        else:
+            print(f"[orchestrator] Worker {job.event_ticker} done")
+
+
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(
         description="Launch WebSocket game_workers for all jobs on a date."
@@ -52,6 +76,17 @@ def _parse_args() -> argparse.Namespace:
         default=10,
         help="Minutes before tipoff each worker should start.",
     )
+    p.add_argument(
+        "--mode",
+        choices=["shared", "tasks", "multiprocess"],
+        default="shared",
+        help=(
+            "shared: stream every game over one WebSocket in this process; "
+            "tasks: one WS per game, as asyncio tasks in this process; "
+            "multiprocess: one game_worker subprocess (and WS) per game "
+            "(isolates a crash-prone game)."
+        ),
+    )
     p.add_argument(
         "--max-workers",
         type=int,
@@ -70,6 +105,34 @@ def main() -> None:
         print("[orchestrator] No jobs after filtering; nothing to do.")
         return
 
+    if args.mode in ("shared", "tasks"):
+        # in-process modes sign in this process; multiprocess workers log
+        # their own backend at startup
+        _log_crypto_backend()
+
+    if args.mode == "shared":
+        print(
+            f"[orchestrator] Streaming {len(jobs)} games for {args.date} "
+            f"over one shared WS"
+        )
+        asyncio.run(
+            _run_ws_for_jobs(
+                [Job(**j) for j in jobs],
+                pregame_minutes=args.pregame_minutes,
+            )
+        )
+        print("[orchestrator] All games done.")
+        return
+
+    if args.mode == "tasks":
+        print(
+            f"[orchestrator] Streaming {len(jobs)} games for {args.date} "
+            f"as in-process tasks"
+        )
+        asyncio.run(_run_job_tasks(jobs, args.pregame_minutes))
+        print("[orchestrator] All games done.")
+        return
+
     print(f"[orchestrator] Launching {len(jobs)} workers for {args.date}")
 
     procs: List[tuple[str, subprocess.Popen]] = []
@@ -21,9 +21,6 @@ MERGED_STATES_DIR = PROJECT_ROOT / "src" / \
     "data" / "kalshi" / "merged" / "states"
 
 
-TERMINAL_STATUSES = {"finalized", "inactive", "settled", "closed"}
-
-
 @dataclass
 class GameJob:
     game_date: str
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
 STATES_DIR = Path("src/data/kalshi/merged/states")
 
+TERMINAL_STATUSES = frozenset({"finalized", "inactive", "settled", "closed"})
+
 
 def _sanitize_state(obj: Any) -> Dict[str, Any] | None:
     """
     Ensure we only pass clean dict states to the engine:
       - obj must be a dict
       - markets must be a list of dicts (or will be set to [])
+      - moneyline_markets holds the moneyline subset, filtered once here
+        so strategies don't re-scan markets on every call
+      - each market gets a precomputed "_terminal" flag (status is one of
+        TERMINAL_STATUSES, case-insensitive)
+      - abs_score_diff holds |score_diff| (when score_diff is numeric), so
+        strategies gating on a close score don't each recompute it
+      - markets_by_id maps market_id -> market (first listing wins), so the
+        engine's per-position market lookups don't scan markets
+
+    market_id strings are interned so every state shares one object per
+    market, which keeps dict lookups in the engine/strategies cheap.
     """
     if not isinstance(obj, dict):
         return None
@@ -24,7 +38,25 @@ def _sanitize_state(obj: Any) -> Dict[str, Any] | None:
     else:
         clean_markets = []
 
+    by_id: Dict[Any, Dict[str, Any]] = {}
+    for m in clean_markets:
+        mid = m.get("market_id")
+        if isinstance(mid, str):
+            mid = m["market_id"] = sys.intern(mid)
+        status = m.get("status")
+        m["_terminal"] = (
+            isinstance(status, str) and status.lower() in TERMINAL_STATUSES
+        )
+        by_id.setdefault(mid, m)
+
     obj["markets"] = clean_markets
+    obj["markets_by_id"] = by_id
+    score_diff = obj.get("score_diff")
+    if isinstance(score_diff, (int, float)):
+        obj["abs_score_diff"] = abs(score_diff)
+    obj["moneyline_markets"] = [
+        m for m in clean_markets if m.get("type") == "moneyline"
+    ]
     return obj
 
 
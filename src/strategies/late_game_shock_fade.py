@@ -1,10 +1,48 @@
 # src/strategies/late_game_shock_fade.py
 
-from typing import Any, Dict, List
-from collections import deque
+from typing import Any, Dict, List, Tuple
+from bisect import bisect_left
 from datetime import datetime, timezone
 
-from .strategy import Strategy, TradeIntent
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    abs_score_diff,
+    ask_first_price,
+    moneyline_markets,
+    open_risk,
+)
+
+
+class _PriceWindow:
+    """
+    Sliding (ts, price) window for one market: two parallel lists plus a
+    head index. Pruning is a bisect on the timestamp list rather than
+    popping tuples one at a time (timestamps are non-decreasing per game).
+    """
+
+    __slots__ = ("ts", "prices", "head")
+
+    def __init__(self) -> None:
+        self.ts: List[float] = []
+        self.prices: List[float] = []
+        self.head: int = 0
+
+    def prune(self, cutoff: float) -> None:
+        head = bisect_left(self.ts, cutoff, self.head)
+        # compact once the dead prefix dominates, so lists stay small
+        if head > 64 and head * 2 > len(self.ts):
+            del self.ts[:head]
+            del self.prices[:head]
+            head = 0
+        self.head = head
+
+    def append(self, ts: float, price: float) -> None:
+        self.ts.append(ts)
+        self.prices.append(price)
+
+    def first_price(self) -> float | None:
+        return self.prices[self.head] if self.head < len(self.prices) else None
 
 
 class LateGameShockFadeStrategy(Strategy):
@@ -13,6 +51,21 @@ class LateGameShockFadeStrategy(Strategy):
     a lot over a short window, buy the opposite side.
     """
 
+    __slots__ = (
+        "stake",
+        "q_late",
+        "t_late",
+        "max_score_diff",
+        "window_seconds",
+        "min_shock_move",
+        "max_delta_score_for_shock",
+        "min_spread_after_shock",
+        "price_min",
+        "price_max",
+        "_last_ts_str",
+        "_last_ts_epoch",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
 
@@ -36,35 +89,30 @@ class LateGameShockFadeStrategy(Strategy):
         self.price_min: float = float(self.params.get("price_min", 0.01))
         self.price_max: float = float(self.params.get("price_max", 0.99))
 
+        # last parsed timestamp (consecutive states often share one)
+        self._last_ts_str: str = ""
+        self._last_ts_epoch: float = 0.0
+
     # -------------------------
     # Helpers
     # -------------------------
 
     def _parse_ts(self, ts_str: str) -> float:
-        if ts_str.endswith("Z"):
-            ts_str = ts_str[:-1] + "+00:00"
-        dt = datetime.fromisoformat(ts_str)
+        if ts_str == self._last_ts_str:
+            return self._last_ts_epoch
+
+        s = ts_str[:-1] + "+00:00" if ts_str.endswith("Z") else ts_str
+        dt = datetime.fromisoformat(s)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return dt.timestamp()
 
-    def _effective_open_price(self, m: Dict[str, Any]) -> float | None:
-        """
-        Mirror execution: pay ask if available, else mid, else bid.
-        """
-        yes_bid = m.get("yes_bid_prob")
-        yes_ask = m.get("yes_ask_prob")
-        mid = m.get("price")
-
-        if yes_ask is not None:
-            return yes_ask
-        if mid is not None:
-            return mid
-        return yes_bid
+        self._last_ts_str = ts_str
+        self._last_ts_epoch = dt.timestamp()
+        return self._last_ts_epoch
 
     def _is_price_shock(
         self,
-        history: deque[tuple[float, float]],
+        history: _PriceWindow,
         current_price: float,
         ts_epoch: float,
     ) -> bool:
@@ -73,14 +121,12 @@ class LateGameShockFadeStrategy(Strategy):
         within window_seconds.
         """
         # prune old points
-        cutoff = ts_epoch - self.window_seconds
-        while history and history[0][0] < cutoff:
-            history.popleft()
+        history.prune(ts_epoch - self.window_seconds)
 
-        if not history:
+        first_price = history.first_price()
+        if first_price is None:
             return False
 
-        first_ts, first_price = history[0]
         # window guaranteed <= window_seconds after prune
         delta_price = current_price - first_price
         return delta_price >= self.min_shock_move
@@ -88,33 +134,27 @@ class LateGameShockFadeStrategy(Strategy):
     def _update_memory(
         self,
         game_mem: Dict[str, Any],
-        markets: List[Dict[str, Any]],
+        priced: List[Tuple[str, float | None]],
         score_diff: float,
         ts_epoch: float,
     ) -> None:
-        last_price: Dict[str, float] = game_mem.setdefault("last_price", {})
-        price_history: Dict[str, deque] = game_mem.setdefault("price_history", {})
+        price_history: Dict[str, _PriceWindow] = game_mem.setdefault(
+            "price_history", {})
 
         cutoff = ts_epoch - self.window_seconds
 
-        for m in markets:
-            if not (isinstance(m, dict) and m.get("type") == "moneyline"):
-                continue
-
-            p = self._effective_open_price(m)
+        for mid_id, p in priced:
             if p is None:
                 continue
 
             mid = float(p)
-            mid_id = m["market_id"]
 
-            hist = price_history.setdefault(mid_id, deque())
+            hist = price_history.get(mid_id)
+            if hist is None:
+                hist = price_history[mid_id] = _PriceWindow()
             # prune old
-            while hist and hist[0][0] < cutoff:
-                hist.popleft()
-            hist.append((ts_epoch, mid))
-
-            last_price[mid_id] = mid
+            hist.prune(cutoff)
+            hist.append(ts_epoch, mid)
 
         game_mem["last_score_diff"] = score_diff
 
@@ -132,7 +172,12 @@ class LateGameShockFadeStrategy(Strategy):
         quarter: int = state["quarter"]
         time_remaining: float = state["time_remaining_minutes"]
         score_diff: float = state["score_diff"]
-        markets = state.get("markets") or []
+        # (market_id, effective open price) per moneyline, priced once per
+        # tick and shared by the shock check and the memory update
+        priced = [
+            (m.get("market_id"), ask_first_price(m))
+            for m in moneyline_markets(state)
+        ]
         game_id = state["game_id"]
         ts_iso: str = state["timestamp"]
         ts_epoch = self._parse_ts(ts_iso)
@@ -142,78 +187,86 @@ class LateGameShockFadeStrategy(Strategy):
             game_id,
             {
                 "last_score_diff": None,
-                "last_price": {},
                 "price_history": {},
             },
         )
 
         last_score_diff = game_mem.get("last_score_diff")
-        price_history: Dict[str, deque] = game_mem.setdefault("price_history", {})
 
         in_window = (
             quarter >= self.q_late
             and time_remaining <= self.t_late
-            and abs(score_diff) <= self.max_score_diff
+            and abs_score_diff(state) <= self.max_score_diff
         )
 
-        if in_window and last_score_diff is not None:
-            moneylines = [
-                m
-                for m in markets
-                if isinstance(m, dict) and m.get("type") == "moneyline"
-            ]
-            positions = portfolio.get("positions", {})
-
-            for m in moneylines:
-                mid = self._effective_open_price(m)
-                if mid is None:
-                    continue
-
-                mid = float(mid)
-                m_id = m["market_id"]
-                hist = price_history.setdefault(m_id, deque())
-
-                # check sliding-window shock for this market (mutates hist by pruning)
-                shocked = self._is_price_shock(hist, mid, ts_epoch)
-                if not shocked:
-                    continue
-
-                # scoreboard change must be small between last tick and now
-                if abs(score_diff - last_score_diff) > self.max_delta_score_for_shock:
-                    continue
-
-                # find opposite side market (assume 2 MLs)
-                others = [mm for mm in moneylines if mm.get("market_id") != m_id]
-                if len(others) != 1:
-                    continue
-
-                opp = others[0]
-                opp_price = self._effective_open_price(opp)
-                if opp_price is None:
-                    continue
-                opp_price = float(opp_price)
-
-                spread = mid - opp_price
-                if spread < self.min_spread_after_shock:
-                    continue
-
-                if not (self.price_min < opp_price < self.price_max):
-                    continue
-
-                opp_pos = positions.get(opp["market_id"])
-                current_risk = opp_pos["dollars_at_risk"] if opp_pos else 0.0
-                if current_risk != 0.0:
-                    continue
-
-                intents.append(
-                    TradeIntent(
-                        market_id=opp["market_id"],
-                        action="open",
-                        position_size=self.stake,
-                    )
+        # Out of window (most of a game) => skip straight to the memory
+        # update. The scoreboard-change gate doesn't depend on the market,
+        # so it is checked here once instead of inside the market loop.
+        if (
+            not in_window
+            or last_score_diff is None
+            or abs(score_diff - last_score_diff) > self.max_delta_score_for_shock
+        ):
+            self._update_memory(game_mem, priced, score_diff, ts_epoch)
+            return intents
+
+        # need exactly the two sides of the game (assume 2 MLs)
+        if len(priced) != 2:
+            self._update_memory(game_mem, priced, score_diff, ts_epoch)
+            return intents
+
+        (a_id, a_price), (b_id, b_price) = priced
+        if a_id == b_id:
+            self._update_memory(game_mem, priced, score_diff, ts_epoch)
+            return intents
+
+        price_history: Dict[str, _PriceWindow] = game_mem.setdefault(
+            "price_history", {})
+        risk_by_id = open_risk(portfolio)
+        min_spread = self.min_spread_after_shock
+        price_min = self.price_min
+        price_max = self.price_max
+
+        for m_id, mid, opp_id, opp_price in (
+            (a_id, a_price, b_id, b_price),
+            (b_id, b_price, a_id, a_price),
+        ):
+            if mid is None:
+                continue
+
+            mid = float(mid)
+            hist = price_history.get(m_id)
+            if hist is None:
+                hist = price_history[m_id] = _PriceWindow()
+
+            # check sliding-window shock for this market (mutates hist by pruning)
+            shocked = self._is_price_shock(hist, mid, ts_epoch)
+            if not shocked:
+                continue
+
+            if opp_price is None:
+                continue
+            opp_price = float(opp_price)
+
+            spread = mid - opp_price
+            if spread < min_spread:
+                continue
+
+            if not (price_min < opp_price < price_max):
+                continue
+
+            if risk_by_id.get(opp_id, 0.0) != 0.0:
+                continue
+
+            intents.append(
+                TradeIntent(
+                    market_id=opp_id,
+                    action="open",
+                    position_size=self.stake,
                 )
-                break  # one trade per tick
+            )
+            break  # one trade per tick
 
         # update memory after decisions
-        self._update_memory(game_mem, markets, score_diff, ts_epoch)
+        self._update_memory(game_mem, priced, score_diff, ts_epoch)
         return intents
@@ -1,7 +1,13 @@
 # src/strategies/late_game_underdog.py
 
 from typing import Any, Dict, List
-from .strategy import Strategy, TradeIntent
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    ask_first_price,
+    moneyline_markets,
+    open_risk,
+)
 
 
 class LateGameUnderdogStrategy(Strategy):
@@ -10,6 +16,15 @@ class LateGameUnderdogStrategy(Strategy):
     and the market is pessimistic. Let the position settle at game end.
     """
 
+    __slots__ = (
+        "max_price",
+        "stake",
+        "max_score_diff",
+        "min_time_remaining",
+        "max_time_remaining",
+        "min_quarter",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
         p = self.params
@@ -23,25 +38,6 @@ class LateGameUnderdogStrategy(Strategy):
         self.max_time_remaining: float = float(p.get("max_time_remaining", 5.0))
         self.min_quarter: int = int(p.get("min_quarter", 4))
 
-    # -------------------------
-    # Internal helpers
-    # -------------------------
-
-    def _effective_open_price(self, m: Dict[str, Any]) -> float | None:
-        """
-        Mirror execution: for opening a YES position we effectively pay the ask.
-        Fallback to mid, then bid if needed.
-        """
-        yes_bid = m.get("yes_bid_prob")
-        yes_ask = m.get("yes_ask_prob")
-        mid = m.get("price")
-
-        if yes_ask is not None:
-            return yes_ask
-        if mid is not None:
-            return mid
-        return yes_bid
-
     # -------------------------
     # Strategy interface
     # -------------------------
@@ -56,43 +52,39 @@ class LateGameUnderdogStrategy(Strategy):
         quarter: int = state["quarter"]
         time_remaining: float = state["time_remaining_minutes"]
         score_diff: float = state["score_diff"]
-        markets = state.get("markets") or []
 
-        # Tunable late-game, close-score filter
+        # Tunable late-game, close-score filter. All scalar gates run before
+        # any market is looked at; most ticks of a game stop here.
         if not (
             quarter >= self.min_quarter
             and self.min_time_remaining < time_remaining < self.max_time_remaining
+            and score_diff <= self.max_score_diff
         ):
             return intents
 
-        # moneyline winner markets only, with usable execution price
-        candidates: List[Dict[str, Any]] = []
-        for m in markets:
-            if not (isinstance(m, dict) and m.get("type") == "moneyline"):
-                continue
-
-            p_eff = self._effective_open_price(m)
+        # moneyline winner markets only, with usable execution price.
+        # Underdog = lowest effective execution price, tracked in the same
+        # pass (first one wins ties, like min()).
+        underdog: Dict[str, Any] | None = None
+        implied_win_prob: float = 0.0
+        for m in moneyline_markets(state):
+            p_eff = ask_first_price(m)
             if p_eff is None or p_eff <= 0.0:
                 continue
 
-            m["_effective_open_price"] = p_eff
-            candidates.append(m)
+            if underdog is None or p_eff < implied_win_prob:
+                underdog = m
+                implied_win_prob = p_eff
 
-        if not candidates:
+        if underdog is None:
             return intents
 
-        # Underdog = lowest effective execution price
-        underdog = min(candidates, key=lambda m: m["_effective_open_price"])
         underdog_market_id = underdog["market_id"]
-        implied_win_prob: float = underdog["_effective_open_price"]
 
-        positions = portfolio.get("positions", {})
-        pos_info = positions.get(underdog_market_id)
-        current_risk = pos_info["dollars_at_risk"] if pos_info else 0.0
+        current_risk = open_risk(portfolio).get(underdog_market_id, 0.0)
 
         if (
-            score_diff <= self.max_score_diff
-            and 0.01 < implied_win_prob < self.max_price
+            0.01 < implied_win_prob < self.max_price
             and current_risk == 0.0  # max 1 open per market
         ):
             intents.append(
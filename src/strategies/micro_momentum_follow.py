@@ -1,9 +1,15 @@
 # src/strategies/micro_momentum_follow.py
 
-from typing import Any, Dict, List
-from .strategy import Strategy, TradeIntent
-
-TERMINAL_STATUSES = {"finalized", "inactive", "settled", "closed"}
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    ask_first_price,
+    is_tradable_market,
+    moneyline_markets,
+    open_risk,
+)
 
 
 class MicroMomentumFollowStrategy(Strategy):
@@ -12,6 +18,16 @@ class MicroMomentumFollowStrategy(Strategy):
     Only enter when the drifting side is still relatively cheap (underdog-ish).
     """
 
+    __slots__ = (
+        "window_states",
+        "min_trend_move",
+        "max_score_diff_change_window",
+        "price_min",
+        "price_max",
+        "entry_max_price",
+        "stake",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
 
@@ -39,39 +55,10 @@ class MicroMomentumFollowStrategy(Strategy):
 
         self.stake: float = self.params.get("stake", 25.0)
 
-        # state["history"] = {market_id: [{"price": p, "score_diff": sd}]}
+        # state["history"] = {market_id: deque([(price, score_diff), ...])}
+        # bounded to window_states, so the oldest entry drops off in O(1)
         self.state.setdefault("history", {})
 
-    # ----------------- helpers -----------------
-
-    def _effective_price(self, m: Dict[str, Any]) -> float | None:
-        yes_bid = m.get("yes_bid_prob")
-        yes_ask = m.get("yes_ask_prob")
-        mid = m.get("price")
-
-        if yes_ask is not None:
-            p = yes_ask
-        elif mid is not None:
-            p = mid
-        else:
-            p = yes_bid
-
-        if p is None:
-            return None
-
-        if not (self.price_min <= p <= self.price_max):
-            return None
-
-        return p
-
-    def _is_tradable_market(self, m: Dict[str, Any]) -> bool:
-        if m.get("type") != "moneyline":
-            return False
-        status = m.get("status")
-        if isinstance(status, str) and status.lower() in TERMINAL_STATUSES:
-            return False
-        return True
-
     # ----------------- main hook -----------------
 
     def on_state(
@@ -80,60 +67,65 @@ class MicroMomentumFollowStrategy(Strategy):
         portfolio: Dict[str, Any],
     ) -> List[TradeIntent]:
         intents: List[TradeIntent] = []
-        history: Dict[str, List[Dict[str, float]]] = self.state["history"]
+        history: Dict[str, Deque[Tuple[float, float]]] = self.state["history"]
 
         curr_score_diff = float(state["score_diff"])
-        markets = [m for m in (state.get("markets") or []) if self._is_tradable_market(m)]
+        markets = [m for m in moneyline_markets(state) if is_tradable_market(m)]
         if not markets:
             return intents
 
-        # Update per-market history with current price + score_diff
-        for m in markets:
-            mid = m["market_id"]
-            p = self._effective_price(m)
-            if p is None:
-                continue
-
-            h = history.setdefault(mid, [])
-            h.append({"price": float(p), "score_diff": curr_score_diff})
-            if len(h) > self.window_states:
-                history[mid] = h[-self.window_states :]
-
-        # Look for the best upward trend with quiet scoreboard,
-        # where the price starts cheap and stays in our band.
+        # One pass: append the current price + score_diff to each market's
+        # history, then scan that same window for the best upward trend with
+        # a quiet scoreboard, where the price starts cheap and stays in our
+        # band. A market's scan only reads its own window, so updating and
+        # scanning together is the same as two separate loops.
         best_mid = None
         best_delta_p = 0.0
 
+        # loop-invariant params as locals
+        window = self.window_states
+        min_move = self.min_trend_move
+        max_sd_change = self.max_score_diff_change_window
+        pmin = self.price_min
+        pmax = self.price_max
+        entry_max = self.entry_max_price
+        history_get = history.get
+
         for m in markets:
             mid = m["market_id"]
-            h = history.get(mid)
-            if not h or len(h) < self.window_states:
-                continue
+            h = history_get(mid)
 
-            first = h[0]
-            last = h[-1]
+            # effective price, only recorded when inside the global bounds
+            p = ask_first_price(m)
+            if p is not None and pmin <= p <= pmax:
+                if h is None:
+                    h = history[mid] = deque(maxlen=window)
+                h.append((float(p), curr_score_diff))
+
+            if not h or len(h) < window:
+                continue
 
-            p_start = first["price"]
-            p_end = last["price"]
+            p_start, sd_start = h[0]
+            p_end, sd_end = h[-1]
             delta_p = p_end - p_start
-            delta_sd = abs(last["score_diff"] - first["score_diff"])
+            delta_sd = abs(sd_end - sd_start)
 
             # Must be an upward drift
             if delta_p <= 0.0:
                 continue
 
             # Require a decent-sized move
-            if delta_p < self.min_trend_move:
+            if delta_p < min_move:
                 continue
 
             # Scoreboard mostly quiet over window
-            if delta_sd > self.max_score_diff_change_window:
+            if delta_sd > max_sd_change:
                 continue
 
             # Only consider underdog-ish prices: start + end fairly cheap
-            if not (self.price_min <= p_start <= self.entry_max_price):
+            if not (pmin <= p_start <= entry_max):
                 continue
-            if not (self.price_min <= p_end <= self.price_max):
+            if not (pmin <= p_end <= pmax):
                 continue
 
             if delta_p > best_delta_p:
@@ -144,9 +136,7 @@ class MicroMomentumFollowStrategy(Strategy):
             return intents
 
         # Only open if we don't already have risk on that market
-        positions = portfolio.get("positions", {})
-        pos_info = positions.get(best_mid)
-        current_risk = pos_info["dollars_at_risk"] if pos_info else 0.0
+        current_risk = open_risk(portfolio).get(best_mid, 0.0)
 
         if current_risk == 0.0:
             intents.append(
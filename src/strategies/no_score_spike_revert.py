@@ -1,9 +1,14 @@
 from typing import Any, Dict, List
-from .strategy import Strategy, TradeIntent
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    ask_first_price,
+    is_tradable_market,
+    moneyline_markets,
+    open_risk,
+)
 
 
-TERMINAL_STATUSES = {"finalized", "inactive", "settled", "closed"}
-
 
 class NoScoreSpikeRevertStrategy(Strategy):
     """
@@ -11,6 +16,14 @@ class NoScoreSpikeRevertStrategy(Strategy):
     if one side's price jumps, buy the *other* side's moneyline.
     """
 
+    __slots__ = (
+        "spike_min_abs",
+        "max_score_diff_change",
+        "price_min",
+        "price_max",
+        "stake",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
 
@@ -34,37 +47,6 @@ class NoScoreSpikeRevertStrategy(Strategy):
         # self.state["last_score_diff"] = float
         # self.state["last_prices"] = {market_id: price}
 
-    def _effective_price(self, m: Dict[str, Any]) -> float | None:
-        """
-        Mirror execution: for opening a YES position we effectively pay the ask.
-        Fallback to mid, then bid if needed, and enforce price bounds.
-        """
-        yes_bid = m.get("yes_bid_prob")
-        yes_ask = m.get("yes_ask_prob")
-        mid = m.get("price")
-
-        if yes_ask is not None:
-            p = yes_ask
-        elif mid is not None:
-            p = mid
-        else:
-            p = yes_bid
-
-        if p is None:
-            return None
-
-        # Enforce global bounds like (0.01, 0.99)
-        if not (self.price_min <= p <= self.price_max):
-            return None
-
-        return p
-
-    def _is_tradable_market(self, m: Dict[str, Any]) -> bool:
-        status = m.get("status")
-        if isinstance(status, str) and status.lower() in TERMINAL_STATUSES:
-            return False
-        return True
-
     def on_state(
         self,
         state: Dict[str, Any],
@@ -73,13 +55,10 @@ class NoScoreSpikeRevertStrategy(Strategy):
         intents: List[TradeIntent] = []
 
         # moneyline + not terminal
-        raw_markets = state.get("markets") or []
         markets = [
             m
-            for m in raw_markets
-            if isinstance(m, dict)
-            and m.get("type") == "moneyline"
-            and self._is_tradable_market(m)
+            for m in moneyline_markets(state)
+            if is_tradable_market(m)
         ]
 
         if len(markets) < 2:
@@ -87,56 +66,75 @@ class NoScoreSpikeRevertStrategy(Strategy):
 
         curr_diff: float = float(state["score_diff"])
         last_diff = self.state.get("last_score_diff")
-        last_prices: Dict[str, float] = self.state.get("last_prices", {})
+        # updated in place: holds last tick's prices until each market's
+        # entry is overwritten with this tick's price below
+        last_prices: Dict[str, float] = self.state.setdefault("last_prices", {})
+
+        # only react if we have a previous tick and the score diff hasn't
+        # changed "too much"
+        react = (
+            bool(last_prices)
+            and last_diff is not None
+            and abs(curr_diff - last_diff) <= self.max_score_diff_change
+        )
+
+        # one pass: compare current (bounded) price to last tick's, then
+        # store the current price for the next tick
+        best_mkt_id = None
+        best_delta = 0.0
+        n_priced = 0
 
-        # current prices (bounded)
-        curr_prices: Dict[str, float] = {}
+        # pay the ask to open YES (falling back to mid, then bid), and skip
+        # degenerate prices outside the global bounds
+        price_min = self.price_min
+        price_max = self.price_max
         for m in markets:
-            p = self._effective_price(m)
-            if p is not None:
-                curr_prices[m["market_id"]] = p
-
-        if last_prices and last_diff is not None:
-            # only react if score diff hasn't changed "too much"
-            if abs(curr_diff - last_diff) <= self.max_score_diff_change:
-                best_mkt_id = None
-                best_delta = 0.0
-
-                for m in markets:
-                    mid = m["market_id"]
-                    if mid not in curr_prices or mid not in last_prices:
-                        continue
-                    delta = curr_prices[mid] - last_prices[mid]
+            mid = m["market_id"]
+            p = ask_first_price(m)
+            if p is None or not (price_min <= p <= price_max):
+                last_prices.pop(mid, None)
+                continue
+
+            if react:
+                prev = last_prices.get(mid)
+                if prev is not None:
+                    delta = p - prev
                     if abs(delta) > abs(best_delta):
                         best_delta = delta
                         best_mkt_id = mid
 
-                if best_mkt_id is not None and abs(best_delta) >= self.spike_min_abs:
-                    # assume exactly two ML markets per game
-                    other_market = None
-                    for m in markets:
-                        if m["market_id"] != best_mkt_id:
-                            other_market = m
-                            break
-
-                    if other_market is not None:
-                        other_id = other_market["market_id"]
-
-                        positions = portfolio.get("positions", {})
-                        pos_info = positions.get(other_id)
-                        current_risk = pos_info["dollars_at_risk"] if pos_info else 0.0
-
-                        if current_risk == 0.0:
-                            intents.append(
-                                TradeIntent(
-                                    market_id=other_id,
-                                    action="open",
-                                    position_size=self.stake,
-                                )
-                            )
+            last_prices[mid] = p
+            n_priced += 1
+
+        # forget markets that are no longer quoted (e.g. a previous game)
+        if len(last_prices) > n_priced:
+            current = {m["market_id"] for m in markets}
+            for mid in [k for k in last_prices if k not in current]:
+                del last_prices[mid]
+
+        if best_mkt_id is not None and abs(best_delta) >= self.spike_min_abs:
+            # assume exactly two ML markets per game
+            other_market = None
+            for m in markets:
+                if m["market_id"] != best_mkt_id:
+                    other_market = m
+                    break
+
+            if other_market is not None:
+                other_id = other_market["market_id"]
+
+                current_risk = open_risk(portfolio).get(other_id, 0.0)
+
+                if current_risk == 0.0:
+                    intents.append(
+                        TradeIntent(
+                            market_id=other_id,
+                            action="open",
+                            position_size=self.stake,
+                        )
+                    )
 
         # update memory
         self.state["last_score_diff"] = curr_diff
-        self.state["last_prices"] = curr_prices
 
         return intents
@@ -1,7 +1,30 @@
 # src/strategies/panic_spread_fade.py
 
-from typing import Any, Dict, List
-from .strategy import Strategy, TradeIntent
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Deque, Dict, List, Tuple
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    mid_first_price,
+    moneyline_markets,
+    open_risk,
+)
+
+_first = itemgetter(0)
+
+
+@dataclass(slots=True)
+class PanicMarketState:
+    """Per-market rolling history + panic lifecycle."""
+    recent_spreads: Deque[float]
+    recent_prices: Deque[float]
+    panic_active: bool = False
+    panic_last_price: float | None = None
+    panic_opp_market_id: str | None = None
+    seq: int = 0                     # first-seen order across market_state
 
 
 class PanicSpreadFadeStrategy(Strategy):
@@ -14,6 +37,17 @@ class PanicSpreadFadeStrategy(Strategy):
       tick where price <= last panic price), buy the OPPOSITE side.
     """
 
+    __slots__ = (
+        "stake",
+        "spread_window",
+        "spread_spike_min",
+        "spread_spike_factor",
+        "min_price_jump",
+        "min_quarter",
+        "price_min",
+        "price_max",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
         self.stake: float = float(self.params.get("stake", 25.0))
@@ -25,30 +59,11 @@ class PanicSpreadFadeStrategy(Strategy):
         self.price_min: float = float(self.params.get("price_min", 0.01))
         self.price_max: float = float(self.params.get("price_max", 0.99))
 
-        # state["market_state"][market_id] = {
-        #   "recent_spreads": [...],
-        #   "recent_prices": [...],
-        #   "panic_active": bool,
-        #   "panic_last_price": float | None,
-        #   "panic_opp_market_id": str | None,
-        # }
+        # state["market_state"][market_id] = PanicMarketState
         self.state.setdefault("market_state", {})
 
     # ---- helpers -----------------------------------------------------
 
-    def _effective_price(self, m: Dict[str, Any]) -> float | None:
-        """
-        Single scalar price to use for detection:
-        prefer mid, then ask, then bid.
-        """
-        mid = m.get("price")
-        ask = m.get("yes_ask_prob")
-        bid = m.get("yes_bid_prob")
-        for v in (mid, ask, bid):
-            if v is not None:
-                return float(v)
-        return None
-
     def _find_opp_market_id(
         self,
         markets: List[Dict[str, Any]],
@@ -57,20 +72,82 @@ class PanicSpreadFadeStrategy(Strategy):
         """
         For now we assume exactly 2 moneyline markets for the game:
         the opposite side is "the other one".
+
+        The id -> opposite-id map is cached and only rebuilt when the
+        moneyline ids change (i.e. a new game), not on every lookup.
+        """
+        key = tuple(m.get("market_id") for m in markets)
+        if key != self.state.get("opp_key"):
+            if len(key) == 2 and key[0] != key[1]:
+                opp_map = {key[0]: key[1], key[1]: key[0]}
+            else:
+                opp_map = {}
+            self.state["opp_key"] = key
+            self.state["opp_id_map"] = opp_map
+        return self.state["opp_id_map"].get(market_id)
+
+    def _check_panic_fade(
+        self,
+        ms: PanicMarketState,
+        mid: str,
+        price: float | None,
+        markets: List[Dict[str, Any]],
+        by_id: Dict[str, Dict[str, Any]],
+        risk_by_id: Dict[str, float],
+    ) -> TradeIntent | None:
+        """
+        Advance an active panic on `mid` by one tick. Returns the fade
+        intent once the panic side stops making new highs; clears
+        panic_active whenever the panic is consumed or dropped.
         """
-        moneylines = [
-            m for m in markets
-            if isinstance(m, dict) and m.get("type") == "moneyline"
-        ]
-        if len(moneylines) != 2:
+        if price is None:
             return None
 
-        ids = [m.get("market_id") for m in moneylines]
-        if market_id not in ids:
+        last_panic_price = ms.panic_last_price
+        if last_panic_price is None:
+            ms.panic_last_price = price
             return None
 
-        other_ids = [mid for mid in ids if mid != market_id]
-        return other_ids[0] if len(other_ids) == 1 else None
+        # Still ripping up → update peak and keep waiting
+        if price > last_panic_price:
+            ms.panic_last_price = price
+            return None
+
+        # First tick where price <= last_panic_price → time to fade
+        opp_id = ms.panic_opp_market_id
+        if not opp_id:
+            opp_id = self._find_opp_market_id(markets, mid)
+            ms.panic_opp_market_id = opp_id
+
+        # From here on this panic is either consumed or dropped
+        ms.panic_active = False
+
+        if not opp_id:
+            # Can't find clean opposite; drop panic
+            return None
+
+        opp_m = by_id.get(opp_id)
+        if not opp_m:
+            return None
+
+        opp_price = mid_first_price(opp_m)
+        if opp_price is None:
+            return None
+        opp_price = float(opp_price)
+
+        # Enforce price band
+        if not (self.price_min <= opp_price <= self.price_max):
+            return None
+
+        # One open position per market max
+        if risk_by_id.get(opp_id, 0.0) > 0.0:
+            return None
+
+        return TradeIntent(
+            market_id=opp_id,
+            action="open",
+            position_size=self.stake,
+        )
 
     # ---- main interface ----------------------------------------------
 
@@ -85,14 +162,11 @@ class PanicSpreadFadeStrategy(Strategy):
         if quarter < self.min_quarter:
             return intents
 
-        markets = [
-            m for m in (state.get("markets") or [])
-            if isinstance(m, dict) and m.get("type") == "moneyline"
-        ]
+        markets = moneyline_markets(state)
         if not markets:
             return intents
 
-        market_state: Dict[str, Dict[str, Any]] = self.state["market_state"]
+        market_state: Dict[str, PanicMarketState] = self.state["market_state"]
 
         # Index markets by id for fast lookup
         by_id: Dict[str, Dict[str, Any]] = {}
@@ -102,120 +176,62 @@ class PanicSpreadFadeStrategy(Strategy):
                 continue
             by_id[mid] = m
 
-        # 1) Update rolling history for all markets
+        risk_by_id = open_risk(portfolio)
+
+        # loop-invariant params as locals
+        window = self.spread_window
+        spike_min = self.spread_spike_min
+        spike_factor = self.spread_spike_factor
+        min_jump = self.min_price_jump
+
+        # (ms.seq, intent) per fade fired this tick; see the sort below
+        fades: List[Tuple[int, TradeIntent]] = []
+
+        # Single pass per market: update its history, then either run the
+        # fade check for an active panic or look for a new one. Markets
+        # don't read each other's history, so this matches running the
+        # three steps as separate loops.
         for m in markets:
             mid = m.get("market_id")
             if not mid:
                 continue
 
-            ms = market_state.setdefault(
-                mid,
-                {
-                    "recent_spreads": [],
-                    "recent_prices": [],
-                    "panic_active": False,
-                    "panic_last_price": None,
-                    "panic_opp_market_id": None,
-                },
-            )
+            ms = market_state.get(mid)
+            if ms is None:
+                ms = market_state[mid] = PanicMarketState(
+                    recent_spreads=deque(maxlen=window),
+                    recent_prices=deque(maxlen=window),
+                    seq=len(market_state),
+                )
 
             spread = m.get("bid_ask_spread")
-            price = self._effective_price(m)
+            price = mid_first_price(m)
+            if price is not None:
+                price = float(price)
 
+            # 1) Update rolling history
+            # bounded deques evict the oldest entry on append
             if spread is not None:
-                rs = ms["recent_spreads"]
-                rs.append(float(spread))
-                if len(rs) > self.spread_window:
-                    rs.pop(0)
+                spread = float(spread)
+                ms.recent_spreads.append(spread)
 
             if price is not None:
-                rp = ms["recent_prices"]
-                rp.append(float(price))
-                if len(rp) > self.spread_window:
-                    rp.pop(0)
-
-        positions = portfolio.get("positions", {})
-
-        # 2) For any *existing* panic, see if price has stopped making new highs
-        for mid, ms in list(market_state.items()):
-            if not ms.get("panic_active"):
-                continue
-
-            m = by_id.get(mid)
-            if not m:
-                continue
-
-            price = self._effective_price(m)
-            if price is None:
-                continue
-
-            last_panic_price = ms.get("panic_last_price")
-            if last_panic_price is None:
-                ms["panic_last_price"] = price
-                continue
-
-            # Still ripping up → update peak and keep waiting
-            if price > last_panic_price:
-                ms["panic_last_price"] = price
-                continue
-
-            # First tick where price <= last_panic_price → time to fade
-            opp_id = ms.get("panic_opp_market_id")
-            if not opp_id:
-                opp_id = self._find_opp_market_id(markets, mid)
-                ms["panic_opp_market_id"] = opp_id
-
-            if not opp_id:
-                # Can't find clean opposite; drop panic
-                ms["panic_active"] = False
-                continue
-
-            opp_m = by_id.get(opp_id)
-            if not opp_m:
-                ms["panic_active"] = False
-                continue
-
-            opp_price = self._effective_price(opp_m)
-            if opp_price is None:
-                ms["panic_active"] = False
-                continue
-
-            # Enforce price band
-            if not (self.price_min <= opp_price <= self.price_max):
-                ms["panic_active"] = False
-                continue
-
-            # One open position per market max
-            pos = positions.get(opp_id)
-            if pos and pos.get("dollars_at_risk", 0.0) > 0.0:
-                ms["panic_active"] = False
-                continue
-
-            intents.append(
-                TradeIntent(
-                    market_id=opp_id,
-                    action="open",
-                    position_size=self.stake,
-                )
-            )
-            ms["panic_active"] = False  # consume this panic
-
-        # 3) Detect *new* panics (only when not already active)
-        for m in markets:
-            mid = m.get("market_id")
-            if not mid:
-                continue
-
-            ms = market_state[mid]
-
-            # skip if already in an active panic lifecycle
-            if ms.get("panic_active"):
-                continue
-
-            spreads = ms["recent_spreads"]
-            prices = ms["recent_prices"]
-            spread = m.get("bid_ask_spread")
-            price = self._effective_price(m)
+                ms.recent_prices.append(price)
+
+            # 2) Existing panic: see if price has stopped making new highs.
+            # A panic that gets consumed or dropped here is inactive again,
+            # so the same tick can still detect a fresh one below.
+            if ms.panic_active:
+                intent = self._check_panic_fade(
+                    ms, mid, price, markets, by_id, risk_by_id)
+                if intent is not None:
+                    fades.append((ms.seq, intent))
+                if ms.panic_active:
+                    continue
+
+            # 3) Detect a *new* panic
+            spreads = ms.recent_spreads
+            prices = ms.recent_prices
 
             if (
                 spread is None
@@ -225,22 +241,26 @@ class PanicSpreadFadeStrategy(Strategy):
             ):
                 continue
 
-            avg_spread = sum(spreads[:-1]) / max(len(spreads) - 1, 1)
+            # average of the history, excluding the current spread. Summed
+            # fresh, in order: whole-cent spreads often sit exactly on the
+            # spike_factor boundary, so a running sum's rounding would flip
+            # the comparison
+            avg_spread = sum(islice(spreads, len(spreads) - 1)) / max(len(spreads) - 1, 1)
             if avg_spread <= 0.0:
                 continue
 
-            curr_spread = float(spread)
-            old_price = float(prices[0])
-            curr_price = float(price)
+            curr_spread = spread
+            old_price = prices[0]
+            curr_price = price
 
             # Spread must be absolutely wide AND relatively wide vs history
-            if curr_spread < self.spread_spike_min:
+            if curr_spread < spike_min:
                 continue
-            if curr_spread < self.spread_spike_factor * avg_spread:
+            if curr_spread < spike_factor * avg_spread:
                 continue
 
             # Price must have ripped up enough over the window
-            if curr_price - old_price < self.min_price_jump:
+            if curr_price - old_price < min_jump:
                 continue
 
             # Lock in this as the initial panic state
@@ -248,8 +268,14 @@ class PanicSpreadFadeStrategy(Strategy):
             if not opp_id:
                 continue
 
-            ms["panic_active"] = True
-            ms["panic_last_price"] = curr_price
-            ms["panic_opp_market_id"] = opp_id
+            ms.panic_active = True
+            ms.panic_last_price = curr_price
+            ms.panic_opp_market_id = opp_id
+
+        # Emit fades in market_state (first-seen) order, as the separate
+        # fade pass over market_state did, not in this tick's listing order
+        if len(fades) > 1:
+            fades.sort(key=_first)
+        intents.extend(intent for _, intent in fades)
 
         return intents
@@ -1,7 +1,13 @@
 # src/strategies/price_shock_momentum.py
 
 from typing import Any, Dict, List
-from .strategy import Strategy, TradeIntent
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    mid_first_price,
+    moneyline_markets,
+    open_risk,
+)
 
 
 class PriceShockMomentumStrategy(Strategy):
@@ -10,6 +16,15 @@ class PriceShockMomentumStrategy(Strategy):
     jump on the move and then exit on a fixed profit or loss.
     """
 
+    __slots__ = (
+        "stake",
+        "min_shock_move",
+        "take_profit_move",
+        "stop_loss_move",
+        "price_min",
+        "price_max",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
 
@@ -27,21 +42,6 @@ class PriceShockMomentumStrategy(Strategy):
         # market_id -> entry price
         self.state.setdefault("entry_price", {})
 
-    # -------------------------
-    # Helpers
-    # -------------------------
-
-    def _effective_price(self, m: Dict[str, Any]) -> float | None:
-        yes_bid = m.get("yes_bid_prob")
-        yes_ask = m.get("yes_ask_prob")
-        mid = m.get("price")
-
-        if mid is not None:
-            return mid
-        if yes_ask is not None:
-            return yes_ask
-        return yes_bid
-
     # -------------------------
     # Strategy interface
     # -------------------------
@@ -53,30 +53,35 @@ class PriceShockMomentumStrategy(Strategy):
     ) -> List[TradeIntent]:
         intents: List[TradeIntent] = []
 
-        markets = state.get("markets") or []
         last_price: Dict[str, float] = self.state["last_price"]
         entry_price: Dict[str, float] = self.state["entry_price"]
-        positions = portfolio.get("positions", {})
+        risk_by_id = open_risk(portfolio)
+
+        # One pricing pass per tick: market_id -> effective price for every
+        # moneyline (first listing wins). Both phases below read from it,
+        # instead of re-scanning markets per open position and re-pricing.
+        # Positions here are always moneylines, since that's all we open.
+        curr_price: Dict[str, float | None] = {}
+        for m in moneyline_markets(state):
+            mid = m.get("market_id")
+            if mid not in curr_price:
+                curr_price[mid] = mid_first_price(m)
 
         # 1) Manage existing positions: take profit or cut loss
-        for mid, pos_info in positions.items():
-            dollars_at_risk = pos_info.get("dollars_at_risk", 0.0)
+        take_profit = self.take_profit_move
+        stop_loss = -self.stop_loss_move
+        for mid, dollars_at_risk in risk_by_id.items():
             if dollars_at_risk <= 0.0:
                 continue
 
-            # find current market
-            m = next((m for m in markets if m.get("market_id") == mid), None)
-            if not m:
-                continue
-
-            p_curr = self._effective_price(m)
+            p_curr = curr_price.get(mid)
             p_entry = entry_price.get(mid)
             if p_curr is None or p_entry is None:
                 continue
 
             move = p_curr - p_entry
 
-            if move >= self.take_profit_move or move <= -self.stop_loss_move:
+            if move >= take_profit or move <= stop_loss:
                 intents.append(
                     TradeIntent(
                         market_id=mid,
@@ -88,21 +93,18 @@ class PriceShockMomentumStrategy(Strategy):
                 entry_price.pop(mid, None)
 
         # 2) Look for fresh shocks and enter
-        for m in markets:
-            if not (isinstance(m, dict) and m.get("type") == "moneyline"):
-                continue
-
-            mid = m.get("market_id")
-            p = self._effective_price(m)
-            if p is None or not (self.price_min < p < self.price_max):
+        price_min = self.price_min
+        price_max = self.price_max
+        min_shock = self.min_shock_move
+        for mid, p in curr_price.items():
+            if p is None or not (price_min < p < price_max):
                 continue
 
             prev = last_price.get(mid)
             last_price[mid] = p  # update for next tick
 
             # only enter if we have no open position in this market
-            pos_info = positions.get(mid)
-            if pos_info and pos_info.get("dollars_at_risk", 0.0) > 0.0:
+            if risk_by_id.get(mid, 0.0) > 0.0:
                 continue
 
             if prev is None:
@@ -111,7 +113,7 @@ class PriceShockMomentumStrategy(Strategy):
             delta = p - prev
 
             # only follow strong upward shocks
-            if delta >= self.min_shock_move:
+            if delta >= min_shock:
                 intents.append(
                     TradeIntent(
                         market_id=mid,
@@ -1,19 +1,114 @@
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
+from data.kalshi.merged.load_states import TERMINAL_STATUSES
 
-@dataclass
+
+@dataclass(slots=True)
 class TradeIntent:
     market_id: str
     action: str           # "open" or "close"
     position_size: float  # dollars
 
 
+def moneyline_markets(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Moneyline markets of a state. Uses the list pre-filtered by the state
+    loader when present, else filters state["markets"] once and memoizes
+    the result on the state so later callers on the same tick reuse it.
+    """
+    ml = state.get("moneyline_markets")
+    if ml is None:
+        ml = [
+            m for m in (state.get("markets") or [])
+            if isinstance(m, dict) and m.get("type") == "moneyline"
+        ]
+        state["moneyline_markets"] = ml
+    return ml
+
+
+def is_tradable_market(m: Dict[str, Any]) -> bool:
+    """
+    False for markets in a terminal status. Uses the "_terminal" flag
+    precomputed by the state loader when present, else derives it.
+    """
+    terminal = m.get("_terminal")
+    if terminal is None:
+        status = m.get("status")
+        terminal = (
+            isinstance(status, str) and status.lower() in TERMINAL_STATUSES
+        )
+    return not terminal
+
+
+def abs_score_diff(state: Dict[str, Any]) -> float:
+    """
+    |score_diff| of a state. Uses the value precomputed by the state
+    loader when present, else takes abs() of the raw diff.
+    """
+    d = state.get("abs_score_diff")
+    if d is None:
+        d = abs(state["score_diff"])
+    return d
+
+
+def open_risk(portfolio: Dict[str, Any]) -> Dict[str, float]:
+    """
+    market_id -> dollars_at_risk for open positions. Uses the map shipped
+    in the portfolio view when present, else derives it from positions.
+    """
+    risk = portfolio.get("risk_by_id")
+    if risk is None:
+        risk = {
+            k: v.get("dollars_at_risk", 0.0)
+            for k, v in (portfolio.get("positions") or {}).items()
+        }
+    return risk
+
+
+def ask_first_price(m: Dict[str, Any]) -> float | None:
+    """
+    Mirror execution: opening a YES position effectively pays the ask,
+    falling back to mid, then bid.
+    """
+    p = m.get("yes_ask_prob")
+    if p is not None:
+        return p
+    p = m.get("price")
+    if p is not None:
+        return p
+    return m.get("yes_bid_prob")
+
+
+def mid_first_price(m: Dict[str, Any]) -> float | None:
+    """
+    Single mark price for detection: prefer mid, then ask, then bid.
+    """
+    p = m.get("price")
+    if p is not None:
+        return p
+    p = m.get("yes_ask_prob")
+    if p is not None:
+        return p
+    return m.get("yes_bid_prob")
+
+
 class Strategy:
+    # subclasses declare __slots__ for their tuned params, so attribute
+    # reads in on_state skip the instance __dict__
+    __slots__ = ("params", "state")
+
     def __init__(self, params: Dict[str, Any] | None = None):
         self.params = params or {}
         self.state: Dict[str, Any] = {}  # optional internal memory
 
+    def prepare(self, states: List[Dict[str, Any]]) -> None:
+        """
+        Optional one-off pass over the full state stream before the first
+        on_state call (backtests only). Default: nothing to precompute.
+        """
+        return None
+
     def on_state(
         self,
         state: Dict[str, Any],        # game-level state, incl. markets[]
@@ -1,5 +1,12 @@
 from typing import Any, Dict, List
-from .strategy import Strategy, TradeIntent
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    abs_score_diff,
+    ask_first_price,
+    moneyline_markets,
+    open_risk,
+)
 
 
 class TightGameCoinflipStrategy(Strategy):
@@ -11,6 +18,15 @@ class TightGameCoinflipStrategy(Strategy):
     - Buy the cheaper side (lower effective probability).
     """
 
+    __slots__ = (
+        "q_crunch",
+        "t_crunch",
+        "close_score_max",
+        "p_low",
+        "p_high",
+        "stake",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
 
@@ -25,25 +41,6 @@ class TightGameCoinflipStrategy(Strategy):
 
         self.stake: float = self.params.get("stake", 25.0)
 
-    # -------------------------
-    # Internal helpers
-    # -------------------------
-
-    def _effective_open_price(self, m: Dict[str, Any]) -> float | None:
-        """
-        Mirror execution: for opening a YES position we effectively pay the ask,
-        then mid, then bid.
-        """
-        yes_bid = m.get("yes_bid_prob")
-        yes_ask = m.get("yes_ask_prob")
-        mid = m.get("price")
-
-        if yes_ask is not None:
-            return yes_ask
-        if mid is not None:
-            return mid
-        return yes_bid
-
     # -------------------------
     # Strategy interface
     # -------------------------
@@ -57,46 +54,48 @@ class TightGameCoinflipStrategy(Strategy):
 
         quarter: int = state["quarter"]
         time_remaining: float = state["time_remaining_minutes"]
-        score_diff: float = state["score_diff"]
-        markets = state.get("markets") or []
 
         # Crunch-time + close score filter
         if not (quarter >= self.q_crunch and time_remaining <= self.t_crunch):
             return intents
 
-        if abs(score_diff) > self.close_score_max:
+        if abs_score_diff(state) > self.close_score_max:
             return intents
 
-        # Collect moneyline markets with effective prices
-        candidates: List[Dict[str, Any]] = []
-        for m in markets:
-            if not (isinstance(m, dict) and m.get("type") == "moneyline"):
-                continue
+        # Need both sides before pricing anything
+        moneylines = moneyline_markets(state)
+        if len(moneylines) < 2:
+            return intents
 
-            p_eff = self._effective_open_price(m)
+        # One pass over the in-band ("coin flip") sides: count them and track
+        # the underdog, i.e. the cheaper side (first one wins ties, like min())
+        n_in_band = 0
+        underdog: Dict[str, Any] | None = None
+        implied = 0.0
+        p_low = self.p_low
+        p_high = self.p_high
+        for m in moneylines:
+            p_eff = ask_first_price(m)
             if p_eff is None:
                 continue
 
             # Must look roughly like a coin flip
-            if not (self.p_low <= p_eff <= self.p_high):
+            if not (p_low <= p_eff <= p_high):
                 continue
 
-            m["_effective_open_price"] = p_eff
-            candidates.append(m)
+            n_in_band += 1
+            if underdog is None or p_eff < implied:
+                underdog = m
+                implied = p_eff
 
-        if len(candidates) < 2:
+        if n_in_band < 2:
             # Need both sides to be reasonably priced in the band
             return intents
 
-        # Underdog here = cheaper side within the coin-flip band
-        underdog = min(candidates, key=lambda m: m["_effective_open_price"])
         market_id = underdog["market_id"]
-        implied = underdog["_effective_open_price"]
 
         # Only one open position per market
-        positions = portfolio.get("positions", {})
-        pos_info = positions.get(market_id)
-        current_risk = pos_info["dollars_at_risk"] if pos_info else 0.0
+        current_risk = open_risk(portfolio).get(market_id, 0.0)
 
         if current_risk == 0.0:
             intents.append(
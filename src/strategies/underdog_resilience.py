@@ -1,5 +1,21 @@
+from dataclasses import dataclass
 from typing import Any, Dict, List
-from .strategy import Strategy, TradeIntent
+from .strategy import (
+    Strategy,
+    TradeIntent,
+    abs_score_diff,
+    mid_first_price,
+    moneyline_markets,
+    open_risk,
+)
+
+
+@dataclass(slots=True)
+class _GameInfo:
+    """Per-game classification, decided once from the first state seen."""
+    skip: bool
+    dog_id: str | None = None
+    dog_pre: float = 0.0
 
 
 class UnderdogResilienceStrategy(Strategy):
@@ -9,6 +25,19 @@ class UnderdogResilienceStrategy(Strategy):
     and the market is still pessimistic on them, buy the dog.
     """
 
+    __slots__ = (
+        "stake",
+        "pregame_underdog_max",
+        "current_underdog_max",
+        "quarter_min",
+        "quarter_max",
+        "time_remaining_min",
+        "time_remaining_max",
+        "max_score_diff",
+        "price_min",
+        "price_max",
+    )
+
     def __init__(self, params: Dict[str, Any] | None = None):
         super().__init__(params)
 
@@ -35,71 +64,75 @@ class UnderdogResilienceStrategy(Strategy):
         self.price_min: float = self.params.get("price_min", 0.01)
         self.price_max: float = self.params.get("price_max", 0.99)
 
-        # per-game memory
+        # per-game memory: state["games"][game_id] = _GameInfo
         self.state.setdefault("games", {})
 
     # -------------------------
 
-    def _effective_price(self, m: Dict[str, Any]) -> float | None:
-        yes_bid = m.get("yes_bid_prob")
-        yes_ask = m.get("yes_ask_prob")
-        mid = m.get("price")
-        if mid is not None:
-            return mid
-        if yes_ask is not None:
-            return yes_ask
-        return yes_bid
-
-    def _ensure_game(self, game_id: str, markets: List[Dict[str, Any]]):
-        games = self.state["games"]
-        if game_id in games:
-            return games[game_id]
-
-        ml = []
+    def _ensure_game(
+        self,
+        game_id: str,
+        markets: List[Dict[str, Any]],
+    ) -> _GameInfo:
+        games: Dict[str, _GameInfo] = self.state["games"]
+        info = games.get(game_id)
+        if info is not None:
+            return info
+
+        # one pass: count priced moneylines and track the cheapest (the
+        # pre-game dog; first one wins ties, like min())
+        n_priced = 0
+        dog: Dict[str, Any] | None = None
+        dog_p0 = 0.0
         for m in markets:
             if m.get("type") != "moneyline":
                 continue
-            p = self._effective_price(m)
+            p = mid_first_price(m)
             if p is None:
                 continue
-            m["_p0"] = p
-            ml.append(m)
+            n_priced += 1
+            if dog is None or p < dog_p0:
+                dog = m
+                dog_p0 = p
 
-        if len(ml) < 2:
-            info = {"skip": True}
-            games[game_id] = info
+        if n_priced < 2:
+            info = games[game_id] = _GameInfo(skip=True)
             return info
 
-        dog = min(ml, key=lambda x: x["_p0"])
-        fav = max(ml, key=lambda x: x["_p0"])
-
-        info = {
-            "dog_id": dog["market_id"],
-            "dog_pre": float(dog["_p0"]),
-            "skip": False,
-        }
-
-        # require clear pre-game dog
-        if info["dog_pre"] > self.pregame_underdog_max:
-            info["skip"] = True
-
-        games[game_id] = info
+        dog_pre = float(dog_p0)
+        info = games[game_id] = _GameInfo(
+            # require clear pre-game dog
+            skip=dog_pre > self.pregame_underdog_max,
+            dog_id=dog["market_id"],
+            dog_pre=dog_pre,
+        )
         return info
 
     # -------------------------
 
+    def prepare(self, states: List[Dict[str, Any]]) -> None:
+        # classify every game from its first state up front, so on_state
+        # only has to look the game up
+        games: Dict[str, _GameInfo] = self.state["games"]
+        for state in states:
+            game_id = state["game_id"]
+            if game_id not in games:
+                self._ensure_game(game_id, state.get("markets") or [])
+
     def on_state(self, state, portfolio) -> List[TradeIntent]:
         intents: List[TradeIntent] = []
 
         game_id = state["game_id"]
-        markets = state.get("markets") or []
+        info = self.state["games"].get(game_id)
+        if info is None:
+            # not seen by prepare() (e.g. live): classify from this state
+            info = self._ensure_game(game_id, state.get("markets") or [])
+        if info.skip:
+            return intents
+
         quarter = state["quarter"]
         t_rem = state["time_remaining_minutes"]
-        score_diff = abs(state["score_diff"])
-
-        info = self._ensure_game(game_id, markets)
-        if info.get("skip"):
-            return intents
+        score_diff = abs_score_diff(state)
 
         # quarter window
         if not (self.quarter_min <= quarter <= self.quarter_max):
@@ -113,13 +146,18 @@ class UnderdogResilienceStrategy(Strategy):
         if score_diff > self.max_score_diff:
             return intents
 
-        # find dog market
-        dog_id = info["dog_id"]
-        dog = next((m for m in markets if m.get("market_id") == dog_id), None)
+        # find dog market: it is a moneyline, so only those need checking
+        # (one lookup per tick, so no point building a full by_id index)
+        dog_id = info.dog_id
+        dog = None
+        for m in moneyline_markets(state):
+            if m.get("market_id") == dog_id:
+                dog = m
+                break
         if not dog:
             return intents
 
-        p = self._effective_price(dog)
+        p = mid_first_price(dog)
         if p is None or not (self.price_min < p < self.price_max):
             return intents
 
@@ -128,12 +166,11 @@ class UnderdogResilienceStrategy(Strategy):
             return intents
 
         # ensure price hasn't shot up too high relative to pregame
-        if p > info["dog_pre"] + 0.10:
+        if p > info.dog_pre + 0.10:
             return intents
 
         # no double-entry
-        pos = portfolio.get("positions", {}).get(dog_id)
-        if pos and pos.get("dollars_at_risk", 0.0) > 0.0:
+        if open_risk(portfolio).get(dog_id, 0.0) > 0.0:
             return intents
 
         intents.append(
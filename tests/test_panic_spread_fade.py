@@ -0,0 +1,51 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from strategies.panic_spread_fade import PanicSpreadFadeStrategy  # noqa: E402
+
+
+def _state(spread: float, price: float):
+    return {
+        "quarter": 2,
+        "markets": [
+            {
+                "market_id": "KX-H",
+                "type": "moneyline",
+                "price": price,
+                "bid_ask_spread": spread,
+            },
+            {
+                "market_id": "KX-A",
+                "type": "moneyline",
+                "price": 1.0 - price,
+                "bid_ask_spread": 0.01,
+            },
+        ],
+    }
+
+
+class SpreadSpikeTieTest(unittest.TestCase):
+    def test_tie_on_spike_factor_matches_exact_average(self):
+        # history 0.1, 0.1, 0.1 averages to 0.30000000000000004 / 3 =
+        # 0.10000000000000002, so 0.2 < 2.0 * avg and this is NOT a spike.
+        # A running sum rounds the average to just under 0.1 and flips it.
+        strat = PanicSpreadFadeStrategy({
+            "spread_window": 4,
+            "spread_spike_factor": 2.0,
+            "spread_spike_min": 0.05,
+            "min_price_jump": 0.05,
+        })
+        portfolio = {"positions": {}}
+        ticks = [(0.1, 0.30), (0.1, 0.32), (0.1, 0.34), (0.2, 0.40)]
+        for spread, price in ticks:
+            self.assertEqual(strat.on_state(_state(spread, price), portfolio), [])
+
+        ms = strat.state["market_state"]["KX-H"]
+        self.assertFalse(ms.panic_active)
+
+
+if __name__ == "__main__":
+    unittest.main()